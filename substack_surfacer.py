@@ -26,39 +26,257 @@ Usage:
 import os
 import csv
 import argparse
+import asyncio
+import functools
 import time
 import re
-import requests
+import httpx
 import sys
 import json
+import itertools
+import bisect
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 from tqdm import tqdm
-from typing import List, Dict, Optional, Callable, Any
-from substack_api import Newsletter, Post
+from typing import List, Dict, Set, Optional, Callable, Any, Awaitable, Tuple, AsyncIterator, Iterable, Iterator, Union
+
+try:
+    # Optional: google-re2 matches the large _preloads pattern in linear time
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Optional: h2 lets httpx speak HTTP/2 (installed by httpx[http2])
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    # Optional: orjson parses the multi-MB profile payloads several times faster
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration constants
 DEFAULT_MAX_RETRIES = 8
 MAX_BACKOFF_WAIT_TIME = 60  # seconds
 REQUEST_TIMEOUT = 10  # seconds
+MAX_CONCURRENT_NEWSLETTERS = 8  # newsletters scraped in parallel (all hit substack.com)
+MAX_CONNECTIONS = 64
+KEEPALIVE_EXPIRY = 30  # seconds an idle pooled connection is kept open
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MAX_CONCURRENT_REQUESTS = 4  # in-flight requests per host (all *.substack.com subdomains count as one)
+MAX_REQUESTS_PER_SECOND = 10  # per host, as above
+ARCHIVE_PAGE_SIZE = 50  # posts per /api/v1/archive request
+CSV_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+IO_WORKERS = 2  # threads for CSV reads/writes
+
+
+def compile_dotall(pattern: str):
+    """Compile a DOTALL pattern with RE2 when available, falling back to the stdlib re engine."""
+    if re2 is not None:
+        options = re2.Options()
+        options.dot_nl = True
+        return re2.compile(pattern, options)
+    return re.compile(pattern, re.DOTALL)
+
+
+# Precompiled regex patterns
+_UNSAFE_CHARS = re.compile(r'[<>:"/\\|?*]')
+_WS_RUN = re.compile(r'[_\s]+')
+_SUB_COUNT = re.compile(r'\\"freeSubscriberCount\\":\\"([^"]+)\\"')
+_SUB_MAG = re.compile(r'\\"freeSubscriberCountOrderOfMagnitude\\":\\"([^"]+)\\"')
+_PRELOADS_DQ = compile_dotall(r'window\._preloads\s*=\s*JSON\.parse\s*\(\s*"((?:[^"\\]|\\.)*)"\s*\)')
+_PRELOADS_SQ = compile_dotall(r'window\._preloads\s*=\s*JSON\.parse\s*\(\s*\'((?:[^\'\\]|\\.)*)\'\s*\)')
+# An escape sequence or a bare double quote inside a single-quoted JS string literal
+_SQ_LITERAL_TOKEN = re.compile(r'\\.|"', re.DOTALL)
+# Substack API timestamps, e.g. 2025-01-01T12:00:00.000Z
+_ISO_UTC_FAST = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?Z$')
+
+
+@dataclass(slots=True)
+class PostInfo:
+    """One output row: a post plus its newsletter's details.
+    
+    Field order is the CSV column order. Rows read back from a CSV hold the raw strings.
+    """
+    newsletter_name: str
+    newsletter_url: str
+    category: str
+    free_subscriber_count: str
+    likes: Union[int, str]
+    likes_per_100_free_subscribers: Union[float, str]
+    post_url: str
+    author: str
+    post_title: str
+    post_subtitle: str
+    post_date: str
+    word_count: Union[int, str]
+    is_paid: Union[bool, str]
+    post_id: Union[int, str]
+
+
+CSV_FIELDNAMES = [field.name for field in fields(PostInfo)]
+_POST_ROW = attrgetter(*CSV_FIELDNAMES)
+
+
+class SubstackRateLimiter:
+    """Limiter capping both the request rate and the number of in-flight requests to one host.
+    
+    Requests are handed evenly spaced start slots; a 429 pushes the next slot back
+    (using the server's Retry-After when given) and holds back tasks already waiting for
+    a slot, so every request that hasn't been sent yet pauses together.
+    """
+    
+    def __init__(self, max_per_second: float = MAX_REQUESTS_PER_SECOND,
+                 max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+        self.interval = 1.0 / max_per_second
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+    
+    async def acquire(self):
+        """Wait for a concurrency slot and for the next free start time."""
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot)
+                self._next_slot = start + self.interval
+            await asyncio.sleep(max(0, start - now))
+            # A 429 may have arrived while this task waited for its slot
+            while (pause := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    def release(self):
+        self._semaphore.release()
+    
+    def defer(self, seconds: float):
+        """Hold back every request not yet sent for the given number of seconds."""
+        resume_at = time.monotonic() + seconds
+        self._paused_until = max(self._paused_until, resume_at)
+        self._next_slot = max(self._next_slot, resume_at)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class HostRateLimiters:
+    """Hands out one SubstackRateLimiter per host.
+    
+    Every *.substack.com newsletter is served by substack.com itself, so they all share a
+    single limiter; each custom domain gets its own.
+    """
+    
+    def __init__(self):
+        self._limiters: Dict[str, SubstackRateLimiter] = {}
+    
+    def for_url(self, url: str) -> SubstackRateLimiter:
+        host = (urlparse(url).hostname or '').lower()
+        if host == 'substack.com' or host.endswith('.substack.com'):
+            host = 'substack.com'
+        if host not in self._limiters:
+            self._limiters[host] = SubstackRateLimiter()
+        return self._limiters[host]
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client; pooled keep-alive connections avoid a TLS handshake per request.
+    
+    HTTP/2 multiplexes concurrent requests to the same *.substack.com host over a single
+    connection; it needs the h2 package (via httpx[http2]), otherwise HTTP/1.1 is used.
+    """
+    reported = False
+    
+    async def report_http_version(response: httpx.Response):
+        # Log the negotiated protocol once so it's clear whether HTTP/2 is in use
+        nonlocal reported
+        if not reported:
+            reported = True
+            print(f"🌐 Connected to {response.url.host} over {response.http_version}")
+    
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        headers={'User-Agent': USER_AGENT},
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+        limits=limits,
+        http2=h2 is not None,
+        event_hooks={'response': [report_http_version]},
+    )
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (seconds or HTTP date) from a failed HTTP response, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    
+    retry_after = headers.get('Retry-After')
+    if not retry_after:
+        return None
+    
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
 
+# Name of the newsletter the current task is processing, when several run concurrently
+_LOG_PREFIX: contextvars.ContextVar[str] = contextvars.ContextVar('log_prefix', default='')
 
-def retry_with_backoff(func: Callable[[], Any], max_retries: int = DEFAULT_MAX_RETRIES, 
-                      operation_name: str = "operation") -> Any:
-    """Execute a function with exponential backoff retry logic for rate limiting."""
+
+def log(message: str):
+    """Print a progress line, tagged with the current newsletter when several are processed at once."""
+    prefix = _LOG_PREFIX.get()
+    if prefix:
+        text = message.lstrip('\n')
+        message = f"{message[:len(message) - len(text)]}[{prefix}] {text.lstrip()}"
+    # One write per line, so lines printed from the I/O threads can't split each other
+    sys.stdout.write(f"{message}\n")
+
+
+async def retry_with_backoff(func: Callable[[], Awaitable[Any]], limiter: SubstackRateLimiter,
+                             max_retries: int = DEFAULT_MAX_RETRIES, operation_name: str = "operation") -> Any:
+    """Await a coroutine function through the rate limiter, backing off on rate limiting."""
     for attempt in range(max_retries):
         try:
-            return func()
+            async with limiter:
+                return await func()
         except Exception as e:
-            error_str = str(e).lower()
-            
-            # Check if it's a rate limiting error (429)
-            if '429' in error_str or 'rate limit' in error_str or 'too many requests' in error_str:
+            # Check the status code itself; the error text includes the URL, whose offset= may contain "429"
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429:
                 if attempt < max_retries - 1:
-                    # Exponential backoff with cap: 1s, 2s, 4s, 8s, 16s (max 60s)
-                    wait_time = min(2 ** attempt, MAX_BACKOFF_WAIT_TIME)
-                    print(f"⏳ Rate limited for {operation_name}, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(wait_time)
+                    # Prefer the server's Retry-After, else exponential backoff with cap: 1s, 2s, 4s, 8s, 16s (max 60s)
+                    retry_after = get_retry_after(e)
+                    wait_time = min(retry_after if retry_after is not None else 2 ** attempt, MAX_BACKOFF_WAIT_TIME)
+                    log(f"⏳ Rate limited for {operation_name}, waiting {wait_time:g}s (attempt {attempt + 1}/{max_retries})")
+                    limiter.defer(wait_time)
                     continue
                 else:
                     return 'Rate limited'
@@ -71,8 +289,8 @@ def retry_with_backoff(func: Callable[[], Any], max_retries: int = DEFAULT_MAX_R
 def ensure_directory(file_path: str):
     """Create directory for file path if it doesn't exist."""
     output_dir = os.path.dirname(file_path)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
         
 def parse_datetime(date_str: str, raise_on_error: bool = False) -> Optional[datetime]:
     """
@@ -90,6 +308,16 @@ def parse_datetime(date_str: str, raise_on_error: bool = False) -> Optional[date
             raise ValueError("Empty date string provided")
         return None
     
+    # Fast path for the UTC timestamps returned by the Substack API
+    match = _ISO_UTC_FAST.match(date_str)
+    if match:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        try:
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                            int(fraction.ljust(6, '0')) if fraction else 0, tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    
     # Try ISO format first (most common for APIs)
     try:
         if 'T' in date_str:
@@ -97,7 +325,17 @@ def parse_datetime(date_str: str, raise_on_error: bool = False) -> Optional[date
     except (ValueError, TypeError):
         pass
     
-    # Try various datetime formats
+    parsed = parse_datetime_with_formats(date_str)
+    
+    # If we get here, parsing failed
+    if parsed is None and raise_on_error:
+        raise ValueError(f"Unable to parse date: {date_str}")
+    return parsed
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_datetime_with_formats(date_str: str) -> Optional[datetime]:
+    """Parse a non-ISO date string against the known formats (memoized, since strptime is slow)."""
     formats = [
         '%Y-%m-%d %H:%M:%S',  # 2025-01-01 12:00:00
         '%Y-%m-%d',           # 2025-01-01
@@ -112,9 +350,6 @@ def parse_datetime(date_str: str, raise_on_error: bool = False) -> Optional[date
         except (ValueError, TypeError):
             continue
     
-    # If we get here, parsing failed
-    if raise_on_error:
-        raise ValueError(f"Unable to parse date: {date_str}")
     return None
 
 def calculate_default_max_posts(from_date: datetime, to_date: datetime) -> int:
@@ -161,8 +396,9 @@ def load_urls_from_file(file_path: str) -> List[Dict[str, str]]:
     return urls
 
 
+@functools.lru_cache(maxsize=2048)
 def normalize_substack_url(url: str) -> str:
-    """Normalize Substack URL to ensure it's in the correct format."""
+    """Normalize Substack URL to ensure it's in the correct format (memoized, it runs several times per URL)."""
     # Remove trailing slashes and ensure proper format
     url = url.rstrip('/')
     
@@ -180,187 +416,255 @@ def normalize_substack_url(url: str) -> str:
     return url
 
 
-def get_free_subscriber_count(publication_url: str, max_retries: int = DEFAULT_MAX_RETRIES) -> str:
+async def get_free_subscriber_count(client: httpx.AsyncClient, limiters: HostRateLimiters, publication_url: str,
+                                    max_retries: int = DEFAULT_MAX_RETRIES) -> str:
     """Get free subscriber count for a Substack newsletter with retries."""
     if not publication_url:
         return 'No URL'
     
     publication_url = normalize_substack_url(publication_url)
     
-    def get_subscriber_count():
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(publication_url, headers=headers, timeout=REQUEST_TIMEOUT)
+    async def get_subscriber_count():
+        response = await client.get(publication_url)
         response.raise_for_status()
         
         content = response.text
         
         # Look for freeSubscriberCount in the content
-        subscriber_match = re.search(r'\\"freeSubscriberCount\\":\\"([^"]+)\\"', content)
+        subscriber_match = _SUB_COUNT.search(content)
         if subscriber_match:
             return subscriber_match.group(1)
         
         # Fallback to freeSubscriberCountOrderOfMagnitude if freeSubscriberCount not found
-        magnitude_match = re.search(r'\\"freeSubscriberCountOrderOfMagnitude\\":\\"([^"]+)\\"', content)
+        magnitude_match = _SUB_MAG.search(content)
         if magnitude_match:
             return magnitude_match.group(1)
         
         return 'UNKNOWN'  # No subscriber count found
     
-    return retry_with_backoff(get_subscriber_count, max_retries, f"subscriber count {publication_url}...")
+    return await retry_with_backoff(get_subscriber_count, limiters.for_url(publication_url), max_retries, f"subscriber count {publication_url}...")
+
+
+async def fetch_archive_page(client: httpx.AsyncClient, limiters: HostRateLimiters, newsletter_url: str,
+                             offset: int, limit: int = ARCHIVE_PAGE_SIZE) -> Any:
+    """Fetch one page of a newsletter's archive (newest first), or an error message string."""
+    async def get_page():
+        response = await client.get(f"{newsletter_url}/api/v1/archive",
+                                    params={'sort': 'new', 'offset': offset, 'limit': limit})
+        response.raise_for_status()
+        return response.json()
+    
+    return await retry_with_backoff(get_page, limiters.for_url(newsletter_url), DEFAULT_MAX_RETRIES, f"archive offset {offset}")
+
+
+async def iter_archive_pages(client: httpx.AsyncClient, limiters: HostRateLimiters, newsletter_url: str,
+                             start_offset: int = 0, first_page: Optional[List[Dict]] = None) -> AsyncIterator[List[Dict]]:
+    """Yield pages of archive entries, newest first, from start_offset until the archive ends.
+    
+    If the page at start_offset has already been fetched, pass it as first_page to reuse it.
+    """
+    offset = start_offset
+    while True:
+        page = first_page if first_page is not None else await fetch_archive_page(client, limiters, newsletter_url, offset)
+        first_page = None
+        if isinstance(page, str):
+            log(f"   ❌ {page}")
+            return
+        
+        yield page
+        
+        if len(page) < ARCHIVE_PAGE_SIZE:
+            return
+        offset += len(page)
+
+
+def select_posts_in_window(page: List[Dict], from_date: datetime,
+                           to_date_inclusive: datetime) -> Tuple[List[Tuple[datetime, Dict]], Optional[datetime]]:
+    """Pick the (post_date, post_data) pairs of a newest-first archive page inside the date window.
+    
+    Dates are parsed once per page and, since the page is sorted, the window is found with two
+    binary searches rather than per-post comparisons. Also returns the date of the first post
+    older than from_date, if the page reaches one.
+    """
+    dated_posts = []
+    for post_data in page:
+        # Parse post date
+        post_date_str = post_data.get('post_date') or post_data.get('created_at')
+        if not post_date_str:
+            log(f"   ⚠️  No date found for post: {post_data.get('title', 'UNKNOWN')}")
+            continue
+        
+        # Convert to datetime using the flexible parser
+        post_date = parse_datetime(post_date_str)
+        if not post_date:
+            log(f"   ⚠️  Could not parse date '{post_date_str}' for post: {post_data.get('title', 'UNKNOWN')}")
+            continue
+        
+        dated_posts.append((post_date, post_data))
+    
+    # Negated timestamps ascend on a newest-first page, as bisect requires
+    keys = [-post_date.timestamp() for post_date, _ in dated_posts]
+    start = bisect.bisect_right(keys, -to_date_inclusive.timestamp())  # first post before to_date_inclusive
+    end = bisect.bisect_right(keys, -from_date.timestamp())  # first post before from_date
+    
+    older_date = dated_posts[end][0] if end < len(dated_posts) else None
+    return dated_posts[start:end], older_date
 
 
-def fetch_newsletter_posts(newsletter_url: str, from_date: datetime, to_date: datetime, max_posts: Optional[int] = None, category: str = '') -> List[Dict]:
+async def find_archive_offset(client: httpx.AsyncClient, limiters: HostRateLimiters, newsletter_url: str,
+                              before: datetime) -> Any:
+    """Find the archive page holding the newest post published before the given date.
+    
+    Returns (offset, page) so the located page can be reused rather than fetched again.
+    Most runs cover recent posts, so the first page is checked before searching; after
+    that, whole pages are probed at exponentially growing page numbers and binary searched
+    between the last two probes, so a window n pages back costs O(log n) requests and a
+    shallow one no more than paging would. Returns an error message string if the
+    archive can't be read.
+    """
+    pages = {}
+    
+    async def reaches(page_number: int) -> Any:
+        page = await fetch_archive_page(client, limiters, newsletter_url, page_number * ARCHIVE_PAGE_SIZE)
+        if isinstance(page, str):
+            return page
+        pages[page_number] = page
+        if len(page) < ARCHIVE_PAGE_SIZE:
+            return True  # Last page of the archive
+        post_date = parse_datetime(page[-1].get('post_date') or '')
+        # Treat undated posts as inside the window; starting early only costs a little extra paging
+        return post_date is None or post_date < before
+    
+    found = await reaches(0)
+    if found is not False:
+        return (0, pages[0]) if found is True else found
+    
+    low, high = 0, 1
+    while True:
+        found = await reaches(high)
+        if isinstance(found, str):
+            return found
+        if found:
+            break
+        low, high = high, high * 2
+    
+    # Invariant: page `low` ends with a post that is too new, page `high` reaches the date
+    while high - low > 1:
+        middle = (low + high) // 2
+        found = await reaches(middle)
+        if isinstance(found, str):
+            return found
+        if found:
+            high = middle
+        else:
+            low = middle
+    
+    return high * ARCHIVE_PAGE_SIZE, pages[high]
+
+
+async def fetch_newsletter_posts(client: httpx.AsyncClient, limiters: HostRateLimiters, newsletter_url: str, from_date: datetime, to_date: datetime,
+                                 max_posts: Optional[int] = None, category: str = '',
+                                 show_progress: bool = True) -> List[PostInfo]:
     """Fetch all posts from a newsletter published within the specified time window."""
     try:
-        original_newsletter_url = newsletter_url
         newsletter_url = normalize_substack_url(newsletter_url)
-        print(f"📰 Fetching posts from: {newsletter_url}")
-        
-        # Initialize newsletter
-        newsletter = Newsletter(newsletter_url)
+        log(f"📰 Fetching posts from: {newsletter_url}")
         
         # Always use URL extraction for newsletter name consistency
         newsletter_name = extract_newsletter_name_from_url(newsletter_url)
         
         # Get free subscriber count for the newsletter
-        print("   👥 Fetching subscriber count...")
-        free_subscriber_count = get_free_subscriber_count(newsletter_url)
-        print(f"   👥 Free subscribers: {free_subscriber_count}")
-        
-        # Fetch posts - the API doesn't support offset-based pagination
-        # We'll fetch a large batch and filter on our end
-        print("   📄 Fetching posts...")
-        
-        # Start with a reasonable limit (API may have its own internal limits)
-        fetch_limit = max_posts if max_posts else 100
-        
-        # Add retry mechanism for getting posts (in case of rate limiting)
-        def get_posts():
-            return newsletter.get_posts(limit=fetch_limit)
+        log("   👥 Fetching subscriber count...")
+        free_subscriber_count = await get_free_subscriber_count(client, limiters, newsletter_url)
+        log(f"   👥 Free subscribers: {free_subscriber_count}")
         
-        posts = retry_with_backoff(get_posts, DEFAULT_MAX_RETRIES, "posts")
+        # Make to_date inclusive by adding one day
+        to_date_inclusive = to_date + timedelta(days=1)
         
-        if isinstance(posts, str):  # Error message from retry_with_backoff
-            print(f"   ❌ {posts}")
-            return []
+        # The archive is newest-first, so skip straight to the first post before to_date
+        # instead of paging through every newer post
+        log("   📄 Locating date window in archive...")
+        located = await find_archive_offset(client, limiters, newsletter_url, to_date_inclusive)
         
-        if not posts:
-            print("   ⚠️  No posts found (empty list returned)")
+        if isinstance(located, str):  # Error message from retry_with_backoff
+            log(f"   ❌ {located}")
             return []
+        start_offset, first_page = located
         
-        print(f"   📄 Retrieved {len(posts)} posts, filtering by date window...")
-        
-        # Make to_date inclusive by adding one day
-        to_date_inclusive = to_date + timedelta(days=1)
+        log(f"   📄 Fetching posts from archive offset {start_offset}, filtering by date window...")
         
         filtered_posts = []
-        for post in tqdm(posts, desc="Filtering posts", unit="post"):
-
-            if 'substack.com/@' in original_newsletter_url:
-                # For @username URLs, we need to follow redirects to get the actual post URL
+        scanned = 0
+        # Progress advances a page at a time; redraw at most every 0.5s
+        progress = tqdm(desc="Filtering posts", unit="post", mininterval=0.5, disable=not show_progress)
+        # Archive entries already carry all the post metadata we need, so each page of
+        # ARCHIVE_PAGE_SIZE posts takes one request instead of one per post
+        async for page in iter_archive_pages(client, limiters, newsletter_url, start_offset, first_page):
+            scanned += len(page)
+            progress.update(len(page))
+            
+            # Check which posts are within the specified time window (to_date is now inclusive)
+            posts_in_window, older_date = select_posts_in_window(page, from_date, to_date_inclusive)
+            
+            for post_date, post_data in posts_in_window:
                 try:
-                    def get_redirected_post_url():
-                        # Get the post's initial URL (this might be in @username format)
-                        post_id = post.url.split('p-')[-1]                        
-                        initial_url = f"https://{original_newsletter_url.split('@')[-1]}.substack.com/p/{post_id}"
-
-                        response = requests.get(initial_url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-                        response.raise_for_status()
-                        
-                        return response.url
-                    
-                    redirected_url = retry_with_backoff(get_redirected_post_url, DEFAULT_MAX_RETRIES, "post URL redirect")
-                    
-                    if isinstance(redirected_url, str) and redirected_url.startswith('http'):
-                        # Successfully got redirected URL, create new post object with correct URL
-                        post = Post(redirected_url)
-                    else:
-                        print(f"   ⚠️  Failed to get redirected URL, skipping post")
-                        continue
-                        
-                except Exception as e:
-                    print(f"   ⚠️  Failed to follow redirect for post: {str(e)}")
-                    continue
-
-            try:
-                # Retry mechanism with exponential backoff for individual post
-                def get_post_metadata():
-                    return post.get_metadata()
-                
-                post_data = retry_with_backoff(get_post_metadata, DEFAULT_MAX_RETRIES, "post metadata")
-                
-                if isinstance(post_data, str) or not post_data:  # Error or no data
-                    continue
-                
-                print(f"🔍 Post metadata: {post_data.get('title', 'UNKNOWN')}")
-                
-                # Parse post date
-                post_date_str = post_data.get('post_date') or post_data.get('created_at')
-                if not post_date_str:
-                    print(f"   ⚠️  No date found for post: {post_data.get('title', 'UNKNOWN')}")
-                    continue
-                
-                # Convert to datetime using the flexible parser
-                post_date = parse_datetime(post_date_str)
-                if not post_date:
-                    print(f"   ⚠️  Could not parse date '{post_date_str}' for post: {post_data.get('title', 'UNKNOWN')}")
-                    continue
-                
-                # Check if post is within the specified time window (to_date is now inclusive)
-                if from_date <= post_date < to_date_inclusive:
                     # Safely extract author name
                     published_bylines = post_data.get('publishedBylines', [])
                     author_name = newsletter_name  # Default fallback
                     if published_bylines and len(published_bylines) > 0:
-                        author_names = [byline.get('name', '') for byline in published_bylines if byline.get('name')]
+                        author_names = [name for byline in published_bylines if (name := byline.get('name'))]
                         author_name = ', '.join(author_names) if author_names else newsletter_name
                     
-                    post_info = {
-                        'newsletter_name': newsletter_name,
-                        'newsletter_url': newsletter_url,
-                        'category': category,
-                        'free_subscriber_count': free_subscriber_count,
-                        'likes': post_data.get('reaction_count', 'UNKNOWN'),
-                        'likes_per_100_free_subscribers': calculate_engagement_rate(post_data.get('reaction_count', 0), free_subscriber_count),
-                        'post_url': post.url if hasattr(post, 'url') else post_data.get('canonical_url', ''),                        
-                        'author': author_name,                        
-                        'post_title': post_data.get('title', 'No Title'),
-                        'post_subtitle': post_data.get('subtitle', ''),                        
-                        'post_date': post_date.strftime('%Y-%m-%d %H:%M:%S'),
-                        'word_count': post_data.get('wordcount', 0),                        
-                        'is_paid': post_data.get('audience', 'everyone') != 'everyone',
-                        'post_id': post_data.get('id', ''),
-                    }
+                    post_info = PostInfo(
+                        newsletter_name=newsletter_name,
+                        newsletter_url=newsletter_url,
+                        category=category,
+                        free_subscriber_count=free_subscriber_count,
+                        likes=post_data.get('reaction_count', 'UNKNOWN'),
+                        likes_per_100_free_subscribers=calculate_engagement_rate(post_data.get('reaction_count', 0), free_subscriber_count),
+                        post_url=post_data.get('canonical_url', ''),
+                        author=author_name,
+                        post_title=post_data.get('title', 'No Title'),
+                        post_subtitle=post_data.get('subtitle', ''),
+                        post_date=post_date.strftime('%Y-%m-%d %H:%M:%S'),
+                        word_count=post_data.get('wordcount', 0),
+                        is_paid=post_data.get('audience', 'everyone') != 'everyone',
+                        post_id=post_data.get('id', ''),
+                    )
                     filtered_posts.append(post_info)
                     
                     # Check if we have enough posts
                     if max_posts and len(filtered_posts) >= max_posts:
                         break
-                elif post_date < from_date:
-                    # Post is older than from_date, stop fetching since posts are chronological
-                    print(f"   ⏹️  Reached post older than {from_date.strftime('%Y-%m-%d')} (post date: {post_date.strftime('%Y-%m-%d')}), stopping...")
-                    break
+                
+                except Exception as e:
+                    log(f"⚠️  Unexpected error processing post: {str(e)[:100]}")
+                    continue
             
-            except Exception as e:
-                print(f"⚠️  Unexpected error processing post: {str(e)[:100]}")
-                continue
+            if max_posts and len(filtered_posts) >= max_posts:
+                break
+            if older_date:
+                # Post is older than from_date, stop fetching since posts are chronological
+                log(f"   ⏹️  Reached post older than {from_date.strftime('%Y-%m-%d')} (post date: {older_date.strftime('%Y-%m-%d')}), stopping...")
+                break
+        progress.close()
+        
+        if not scanned:
+            log("   ⚠️  No posts found in archive")
         
         if max_posts and len(filtered_posts) < max_posts:
-            print(f"   ℹ️  Only found {len(filtered_posts)} posts in time window {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}")
+            log(f"   ℹ️  Only found {len(filtered_posts)} posts in time window {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}")
         
         # Check if we hit the max_posts limit exactly - this might indicate more posts are available
         if max_posts and len(filtered_posts) == max_posts:
             error_msg = f"⚠️  Hit max_posts limit ({max_posts}) - there may be more posts available. Consider increasing --max-posts or narrowing the date range."
-            print(f"   ❌ {error_msg}")
+            log(f"   ❌ {error_msg}")
             raise ValueError(error_msg)
         
         return filtered_posts
         
     except Exception as e:
-        print(f"❌ Error processing newsletter {newsletter_url}: {e}")
+        log(f"❌ Error processing newsletter {newsletter_url}: {e}")
         return []
 
 
@@ -381,77 +685,83 @@ def calculate_engagement_rate(likes: str, free_subscriber_count: str) -> float:
     return round(100 * (likes / subscriber_num), 2)
 
 
-def save_posts_to_csv(posts: List[Dict], output_file: str):
-    """Save post data to a CSV file."""
+def save_posts_to_csv(posts: Iterable[PostInfo], output_file: str) -> int:
+    """Save post data to a CSV file, streaming rows from any iterable. Returns the number of posts written."""
     ensure_directory(output_file)
     
-    if not posts:
-        print("📝 Creating empty CSV file (no posts to save)...")
-    else:
-        print(f"💾 Writing {len(posts)} posts to CSV...")
-            
-    fieldnames = [
-        'newsletter_name', 'newsletter_url', 'category', 'free_subscriber_count',
-        'likes', 'likes_per_100_free_subscribers',
-        'post_url', 'author', 'post_title', 'post_subtitle', 'post_date',
-        'word_count', 'is_paid', 'post_id'
-    ]
+    log(f"💾 Writing posts to CSV: {output_file}...")
     
     # Write posts to CSV file (or create empty file with headers)
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    # A large buffer and a single writerows() call keep the write in C with few syscalls
+    written = 0
+    
+    def rows() -> Iterator[Tuple]:
+        nonlocal written
+        for post in posts:
+            written += 1
+            yield _POST_ROW(post)
+    
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
         
-        writer.writeheader()
-        if posts:
-            for post in tqdm(posts, desc="Writing CSV", unit="row"):
-                writer.writerow(post)
+        writer.writerow(CSV_FIELDNAMES)
+        writer.writerows(rows())
     
-    print(f"✅ Successfully saved {len(posts)} posts to: {output_file}")
+    if not written:
+        log(f"📝 Created empty CSV file (no posts to save): {output_file}")
+    else:
+        log(f"✅ Successfully saved {written} posts to: {output_file}")
+    return written
 
 
-def check_existing_newsletter_file(url: str) -> Optional[str]:
+def list_existing_newsletter_files(directory: str = 'substacks') -> Set[str]:
+    """List the files already in the newsletter output directory (one listing instead of a stat per URL)."""
+    return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+
+def newsletter_csv_path(url: str) -> str:
+    """Return the per-newsletter CSV path a URL is saved to in multi-newsletter runs."""
+    newsletter_name_safe = sanitize_filename(extract_newsletter_name_from_url(url))
+    return os.path.join('substacks', f"{newsletter_name_safe}.csv")
+
+
+def check_existing_newsletter_file(url: str, existing_files: Set[str]) -> Optional[str]:
     """Check if a CSV file already exists for this newsletter and return the filename if it does."""
-    # Generate the expected filename for this newsletter
-    newsletter_name = extract_newsletter_name_from_url(url)
-    newsletter_name_safe = sanitize_filename(newsletter_name)
-    
-    # Check for individual newsletter file in substacks directory
-    expected_filename = os.path.join('substacks', f"{newsletter_name_safe}.csv")
-    
-    # Also check the original filename (in case it's a single newsletter run)
-    possible_files = [expected_filename]
-    
-    for filename in possible_files:
-        if os.path.exists(filename):  # Now accepts empty files too (size >= 0)
-            return filename
-    
-    return None
+    # Check for the same path the newsletter is saved to (empty files count too)
+    path = newsletter_csv_path(url)
+    return path if os.path.basename(path) in existing_files else None
 
 
-def load_existing_posts_from_csv(csv_file: str) -> List[Dict]:
-    """Load existing posts from a CSV file."""
-    posts = []
+def iter_posts_from_csv(csv_file: str, category: str = '') -> Iterator[PostInfo]:
+    """Stream posts from a CSV file one row at a time, filling in the category if it wasn't set before."""
     try:
-        with open(csv_file, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                posts.append(dict(row))
-        print(f"   📄 Loaded {len(posts)} existing posts from {csv_file}")
-        return posts
+        with open(csv_file, 'r', encoding='utf-8', newline='') as csvfile:
+            for row in csv.DictReader(csvfile):
+                post = PostInfo(*(row.get(name) or '' for name in CSV_FIELDNAMES))
+                if not post.category and category:
+                    post.category = category
+                yield post
     except Exception as e:
         print(f"   ⚠️  Error loading existing CSV {csv_file}: {e}")
-        return []
 
 
+def count_posts_in_csv(csv_file: str) -> int:
+    """Count the posts in an existing CSV file without keeping them in memory."""
+    count = sum(1 for _ in iter_posts_from_csv(csv_file))
+    print(f"   📄 Found {count} existing posts in {csv_file}")
+    return count
+
+
+@functools.lru_cache(maxsize=2048)
 def sanitize_filename(name: str) -> str:
     """Sanitize a string to be safe for use as a filename."""
     # Replace or remove characters that are not safe for filenames
     # Keep alphanumeric, spaces, hyphens, and underscores
     
     # Replace unsafe characters with underscores
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
+    sanitized = _UNSAFE_CHARS.sub('_', name)
     # Replace multiple spaces/underscores with single underscore
-    sanitized = re.sub(r'[_\s]+', '_', sanitized)
+    sanitized = _WS_RUN.sub('_', sanitized)
     # Remove leading/trailing underscores and spaces
     sanitized = sanitized.strip('_ ')
     # Limit length to avoid filesystem issues
@@ -460,6 +770,7 @@ def sanitize_filename(name: str) -> str:
     return sanitized if sanitized else 'unknown'
 
 
+@functools.lru_cache(maxsize=2048)
 def extract_newsletter_name_from_url(url: str) -> str:
     """Extract newsletter name from Substack URL."""
     try:
@@ -481,38 +792,43 @@ def extract_newsletter_name_from_url(url: str) -> str:
         return 'unknown'
 
 
-def get_newsletters_from_profile(profile_url: str) -> List[str]:
+async def get_newsletters_from_profile(client: httpx.AsyncClient, limiters: HostRateLimiters,
+                                      profile_url: str) -> List[str]:
     """Extract newsletter URLs from a Substack profile page."""
     try:
         print(f"📋 Fetching newsletters from profile: {profile_url}")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(profile_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        async with limiters.for_url(profile_url):
+            response = await client.get(profile_url)
         response.raise_for_status()
         
         content = response.text
                 
         # More flexible regex to handle various whitespace patterns and escaped quotes
         # The JSON string can contain escaped quotes and span multiple lines
-        preloads_match = re.search(r'window\._preloads\s*=\s*JSON\.parse\s*\(\s*"((?:[^"\\]|\\.)*)"\s*\)', content, re.DOTALL)
+        preloads_match = _PRELOADS_DQ.search(content)
+        literal = preloads_match.group(1) if preloads_match else None
         if not preloads_match:
             # Try alternative pattern in case the JSON string uses single quotes or different structure
-            preloads_match = re.search(r'window\._preloads\s*=\s*JSON\.parse\s*\(\s*\'((?:[^\'\\]|\\.)*)\'\s*\)', content, re.DOTALL)
+            preloads_match = _PRELOADS_SQ.search(content)
+            if preloads_match:
+                # Rewrite the single-quoted JS literal as a double-quoted one: escape bare quotes,
+                # unescape \' and leave every other escape sequence (including \") untouched
+                literal = _SQ_LITERAL_TOKEN.sub(
+                    lambda m: '\\"' if m.group() == '"' else ("'" if m.group() == "\\'" else m.group()),
+                    preloads_match.group(1),
+                )
         
         if not preloads_match:
             print("   ❌ Could not find profile data in page")
             return []
         
-        # Decode the JSON string (it's double-encoded)
-        json_str = preloads_match.group(1)
-        # Unescape the JSON string
-        json_str = json_str.replace('\\"', '"').replace('\\\\', '\\')
-        
         try:
-            data = json.loads(json_str)
+            # The payload is double-encoded: decoding the string literal with the C-level
+            # JSON decoder unescapes it in one pass, then the result is the actual JSON object
+            json_str = json.loads(f'"{literal}"', strict=False)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handler below covers both
+            data = orjson.loads(json_str) if orjson else json.loads(json_str)
             print(f"   ✅ Successfully parsed JSON data")
         except json.JSONDecodeError as e:
             print(f"   ❌ Failed to parse profile JSON: {e}")
@@ -546,7 +862,7 @@ def get_newsletters_from_profile(profile_url: str) -> List[str]:
         print(f"   ✅ Found {len(newsletter_urls)} newsletter(s)")
         return newsletter_urls
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"   ❌ Error fetching profile page: {e}")
         return []
     except Exception as e:
@@ -554,7 +870,72 @@ def get_newsletters_from_profile(profile_url: str) -> List[str]:
         return []
 
 
-def main():
+async def process_newsletter(client: httpx.AsyncClient, limiters: HostRateLimiters, i: int, total: int, url_data: Dict[str, str],
+                             from_date: datetime, to_date: datetime, max_posts: Optional[int],
+                             force_rescrape: bool, output: str, existing_files: Set[str],
+                             io_pool: ThreadPoolExecutor) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    """Scrape a single newsletter to its CSV file, or reuse the existing one.
+    
+    Returns a (status, csv_file, post_count) tuple where status is 'skipped', 'processed'
+    or None on failure (in which case csv_file is None). Skipped newsletters report a
+    post_count of None; their rows are counted when the file is next read.
+    """
+    loop = asyncio.get_running_loop()
+    url = url_data['url']
+    category = url_data['category']
+    category_display = f" ({category})" if category else ""
+    if total > 1:
+        # Newsletters run concurrently, so tag their interleaved output with the newsletter name
+        _LOG_PREFIX.set(extract_newsletter_name_from_url(url))
+    log(f"\n📰 Processing newsletter {i}/{total}: {url}{category_display}")
+    
+    # Check if this newsletter was already scraped (unless force-rescrape is enabled)
+    if not force_rescrape:
+        existing_file = check_existing_newsletter_file(url, existing_files)
+        if existing_file:
+            log(f"   ✅ Found existing file: {existing_file}")
+            log(f"   ⏭️  Skipping this newsletter (use --force-rescrape to override)")
+            
+            # Don't read the file here; it is counted once, when the combined CSV streams it
+            # (empty files are valid and still mark the newsletter as done)
+            return 'skipped', existing_file, None
+    
+    try:
+        # Concurrent progress bars would draw over each other, so only show one for a single newsletter
+        posts = await fetch_newsletter_posts(client, limiters, url, from_date, to_date, max_posts, category,
+                                             show_progress=total == 1)
+        
+        if not posts:
+            log(f"   📝 No posts found for this newsletter - creating empty file to mark as processed")
+        else:
+            log(f"   ✅ Found {len(posts)} posts")
+        
+        # Save CSV immediately after processing this newsletter
+        log(f"   💾 Saving results for this newsletter...")
+        
+        # Create output filename with newsletter name
+        if total > 1:
+            # For multiple newsletters, create individual files in the substacks directory using newsletter name
+            individual_output = newsletter_csv_path(url)
+        else:
+            # For single newsletter, use original filename in root directory
+            individual_output = output
+        
+        # Run in this task's context so the writer's output carries the newsletter tag too
+        await loop.run_in_executor(io_pool, contextvars.copy_context().run, save_posts_to_csv, posts, individual_output)
+        
+        log(f"   ✅ Saved {len(posts)} posts to: {individual_output}")
+        
+        # Add to total collection (even if empty, for tracking)
+        return 'processed', individual_output, len(posts)
+    
+    except Exception as e:
+        log(f"   ❌ Error processing newsletter {url}: {e}")
+        log(f"   🔄 You can resume by running the same command again - completed newsletters will be skipped")
+        return None, None, 0
+
+
+async def main():
     parser = argparse.ArgumentParser(
         description='Fetch Substack posts published within a time window with like counts',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -612,92 +993,78 @@ Resume functionality:
         print(f"📊 Default max posts set to {default_max_posts} (1 per day since {from_date.strftime('%Y-%m-%d')})")
         args.max_posts = default_max_posts
     
-    # Get list of URLs
-    if args.url:
-        urls = [{'url': args.url, 'category': ''}]
-    elif args.user:
-        # Handle profile username - add @ if not present and construct full URL
-        username = args.user.lstrip('@')  # Remove @ if present
-        profile_url = f"https://substack.com/@{username}"
-        newsletter_urls = get_newsletters_from_profile(profile_url)
-        urls = [{'url': url, 'category': ''} for url in newsletter_urls]
-    else:
-        urls = load_urls_from_file(args.urls)
-        if not urls:
-            print("❌ No valid URLs found.")
-            return
-    
-    print(f"🔗 Processing {len(urls)} newsletter(s)...")
-    
-    # Track all posts for final summary
-    all_posts = []
+    limiters = HostRateLimiters()
     
-    # Track skipped and processed newsletters
-    skipped_newsletters = []
-    processed_newsletters = []
-    
-    # Process each newsletter individually
-    for i, url_data in enumerate(urls, 1):
-        url = url_data['url']
-        category = url_data['category']
-        category_display = f" ({category})" if category else ""
-        print(f"\n📰 Processing newsletter {i}/{len(urls)}: {url}{category_display}")
-        
-        # Check if this newsletter was already scraped (unless force-rescrape is enabled)
-        if not args.force_rescrape:
-            existing_file = check_existing_newsletter_file(url)
-            if existing_file:
-                print(f"   ✅ Found existing file: {existing_file}")
-                print(f"   ⏭️  Skipping this newsletter (use --force-rescrape to override)")
-                
-                # Load existing data
-                existing_posts = load_existing_posts_from_csv(existing_file)
-                
-                # Update category in existing posts if it wasn't set before
-                for post in existing_posts:
-                    if not post.get('category') and category:
-                        post['category'] = category
-                
-                # Add to collections regardless of whether there are posts (empty files are valid)
-                all_posts.extend(existing_posts)
-                skipped_newsletters.append(url)
-                continue
+    # One pooled client is shared by every request made during the run
+    async with create_http_client() as client:
+        # Get list of URLs
+        if args.url:
+            urls = [{'url': args.url, 'category': ''}]
+        elif args.user:
+            # Handle profile username - add @ if not present and construct full URL
+            username = args.user.lstrip('@')  # Remove @ if present
+            profile_url = f"https://substack.com/@{username}"
+            newsletter_urls = await get_newsletters_from_profile(client, limiters, profile_url)
+            urls = [{'url': url, 'category': ''} for url in newsletter_urls]
+        else:
+            urls = load_urls_from_file(args.urls)
+            if not urls:
+                print("❌ No valid URLs found.")
+                return
         
-        try:
-            posts = fetch_newsletter_posts(url, from_date, to_date, args.max_posts, category)
-            
-            if not posts:
-                print(f"   📝 No posts found for this newsletter - creating empty file to mark as processed")
-            else:
-                print(f"   ✅ Found {len(posts)} posts")
-                            
-            # Add to total collection (even if empty, for tracking)
-            all_posts.extend(posts)
-            processed_newsletters.append(url)
-            
-            # Save CSV immediately after processing this newsletter
-            print(f"   💾 Saving results for this newsletter...")
+        print(f"🔗 Processing {len(urls)} newsletter(s)...")
+        
+        # List previously scraped newsletters once, up front
+        existing_files = list_existing_newsletter_files()
+        
+        # Process newsletters concurrently, capping how many hit substack.com at once
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_NEWSLETTERS)
+        
+        # CSV reads and writes run on worker threads, overlapping disk I/O with other newsletters' requests
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as io_pool:
+            async def process_with_limit(i: int, url_data: Dict[str, str]) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+                async with semaphore:
+                    return await process_newsletter(client, limiters, i, len(urls), url_data, from_date, to_date,
+                                                    args.max_posts, args.force_rescrape, args.output,
+                                                    existing_files, io_pool)
             
-            # Create output filename with newsletter name
-            if len(urls) > 1:
-                # For multiple newsletters, create individual files using newsletter name
-                newsletter_name = extract_newsletter_name_from_url(url)
-                newsletter_name_safe = sanitize_filename(newsletter_name)
-                
-                # Create filename in substacks directory
-                individual_output = os.path.join('substacks', f"{newsletter_name_safe}.csv")
-            else:
-                # For single newsletter, use original filename in root directory
-                individual_output = args.output
+            async def reuse_duplicate(i: int, url_data: Dict[str, str],
+                                      first: asyncio.Task) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+                status, csv_file, post_count = await first
+                _LOG_PREFIX.set(extract_newsletter_name_from_url(url_data['url']))
+                log(f"\n📰 Newsletter {i}/{len(urls)}: {url_data['url']} saves to the same file as an earlier URL")
+                log(f"   ⏭️  Skipping this duplicate (the earlier URL's file is reused)")
+                return ('duplicate', csv_file, None) if csv_file else (None, None, 0)
             
-            save_posts_to_csv(posts, individual_output)
+            # URLs that map to the same output file are scraped once: the first one writes the
+            # file (keeping its category) and later ones wait for it instead of racing it
+            tasks = []
+            first_by_file: Dict[str, asyncio.Task] = {}
+            for i, url_data in enumerate(urls, 1):
+                output_file = newsletter_csv_path(url_data['url'])
+                if output_file in first_by_file:
+                    tasks.append(reuse_duplicate(i, url_data, first_by_file[output_file]))
+                else:
+                    first_by_file[output_file] = asyncio.ensure_future(process_with_limit(i, url_data))
+                    tasks.append(first_by_file[output_file])
             
-            print(f"   ✅ Saved {len(posts)} posts to: {individual_output}")
-        
-        except Exception as e:
-            print(f"   ❌ Error processing newsletter {url}: {e}")
-            print(f"   🔄 You can resume by running the same command again - completed newsletters will be skipped")
-            continue
+            results = await asyncio.gather(*tasks)
+    
+    # Track skipped, processed and duplicate newsletters
+    skipped_newsletters = []
+    processed_newsletters = []
+    duplicate_newsletters = []
+    
+    # Collect results in input order so the combined CSV is deterministic
+    for url_data, (status, csv_file, post_count) in zip(urls, results):
+        if status == 'skipped':
+            skipped_newsletters.append(url_data['url'])
+        elif status == 'processed':
+            processed_newsletters.append(url_data['url'])
+        elif status == 'duplicate':
+            duplicate_newsletters.append(url_data['url'])
+    
+    total_posts = 0
     
     # Save combined results if processing multiple newsletters
     if len(urls) > 1:
@@ -705,16 +1072,32 @@ Resume functionality:
         
         combined_output = os.path.join('combined.csv')
         
-        save_posts_to_csv(all_posts, combined_output)
+        # Stream every newsletter's rows straight from its CSV, so memory stays at one row;
+        # duplicate URLs share one file, which is only included the first time
+        combined_files = {}
+        for url_data, (status, csv_file, post_count) in zip(urls, results):
+            if csv_file:
+                combined_files.setdefault(csv_file, url_data['category'])
+        combined_posts = itertools.chain.from_iterable(
+            iter_posts_from_csv(csv_file, category) for csv_file, category in combined_files.items()
+        )
+        # The combined file holds every row, so its count is the run's total
+        total_posts = save_posts_to_csv(combined_posts, combined_output)
         
         print(f"✅ Saved combined results: {combined_output}")
+    elif results:
+        # Single newsletter: count the one file directly, reading it only if it was skipped
+        status, csv_file, post_count = results[0]
+        total_posts = count_posts_in_csv(csv_file) if status == 'skipped' else post_count
     
     # Summary
-    print(f"\n🎉 Completed! Processed {len(all_posts)} posts total.")
+    print(f"\n🎉 Completed! Processed {total_posts} posts total.")
     if processed_newsletters:
         print(f"📊 Newly processed newsletters: {len(processed_newsletters)}")
     if skipped_newsletters:
         print(f"⏭️  Skipped newsletters (already existed): {len(skipped_newsletters)}")
+    if duplicate_newsletters:
+        print(f"🔁 Duplicate URLs (same newsletter as an earlier URL): {len(duplicate_newsletters)}")
     
     print(f"📊 Individual newsletter files saved after each processing step")
     if len(urls) > 1:
@@ -729,4 +1112,4 @@ Resume functionality:
 
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file